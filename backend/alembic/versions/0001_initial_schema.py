@@ -0,0 +1,83 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "students",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("email", sa.String()),
+        sa.Column("phone", sa.String()),
+        sa.Column("identity_key", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index(
+        "ix_students_identity_key", "students", ["identity_key"], unique=True
+    )
+
+    op.create_table(
+        "tests",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("max_marks", sa.Integer()),
+        sa.Column("negative_marking", postgresql.JSONB()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+    op.create_table(
+        "attempts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("student_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("students.id")),
+        sa.Column("test_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tests.id")),
+        sa.Column("source_event_id", sa.String()),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("submitted_at", sa.DateTime()),
+        sa.Column("answers", postgresql.JSONB()),
+        sa.Column("raw_payload", postgresql.JSONB()),
+        sa.Column("status", sa.String()),
+        sa.Column("duplicate_of_attempt_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+
+    op.create_table(
+        "attempt_scores",
+        sa.Column("attempt_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("attempts.id"), primary_key=True),
+        sa.Column("correct", sa.Integer()),
+        sa.Column("wrong", sa.Integer()),
+        sa.Column("skipped", sa.Integer()),
+        sa.Column("accuracy", sa.Integer()),
+        sa.Column("net_correct", sa.Integer()),
+        sa.Column("score", sa.Integer()),
+        sa.Column("explanation", postgresql.JSONB()),
+        sa.Column("computed_at", sa.DateTime()),
+    )
+
+    op.create_table(
+        "flags",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("attempt_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("attempts.id")),
+        sa.Column("reason", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("flags")
+    op.drop_table("attempt_scores")
+    op.drop_table("attempts")
+    op.drop_table("tests")
+    op.drop_index("ix_students_identity_key", table_name="students")
+    op.drop_table("students")
@@ -0,0 +1,79 @@
+"""score distributions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "score_distributions",
+        sa.Column("test_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tests.id"), primary_key=True),
+        sa.Column("bin_width", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("histogram", postgresql.JSONB(), nullable=False, server_default="{}"),
+        sa.Column("sketch", postgresql.JSONB(), nullable=False, server_default="{}"),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+    # backfill from existing scored attempts, same rules as
+    # app/distribution.py (NUM_BINS = 20, floor division into bins)
+    op.execute(
+        """
+        WITH scored AS (
+            SELECT
+                a.test_id,
+                s.score,
+                CASE
+                    WHEN t.max_marks IS NULL OR t.max_marks <= 0 THEN 1
+                    ELSE greatest(1, ceil(t.max_marks / 20.0))::int
+                END AS bin_width
+            FROM attempts a
+            JOIN attempt_scores s ON s.attempt_id = a.id
+            JOIN tests t ON t.id = a.test_id
+            WHERE a.status = 'SCORED' AND s.score IS NOT NULL
+        ),
+        bins AS (
+            SELECT test_id, floor(score::numeric / bin_width)::int AS bin, count(*) AS n
+            FROM scored
+            GROUP BY test_id, bin
+        ),
+        score_counts AS (
+            SELECT test_id, score, count(*) AS n
+            FROM scored
+            GROUP BY test_id, score
+        ),
+        totals AS (
+            SELECT test_id, bin_width, count(*) AS n, sum(score) AS total
+            FROM scored
+            GROUP BY test_id, bin_width
+        )
+        INSERT INTO score_distributions (
+            test_id, bin_width, count, total, histogram, sketch, updated_at
+        )
+        SELECT
+            totals.test_id,
+            totals.bin_width,
+            totals.n,
+            totals.total,
+            (SELECT jsonb_object_agg(b.bin::text, b.n) FROM bins b WHERE b.test_id = totals.test_id),
+            (SELECT jsonb_object_agg(c.score::text, c.n) FROM score_counts c WHERE c.test_id = totals.test_id),
+            now()
+        FROM totals
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("score_distributions")
@@ -0,0 +1,32 @@
+"""ingest checkpoints
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ingest_checkpoints",
+        sa.Column("source", sa.String(), primary_key=True),
+        sa.Column("file_name", sa.String()),
+        sa.Column("offset", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index(
+        "ix_attempts_source_event_id", "attempts", ["source_event_id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_attempts_source_event_id", table_name="attempts")
+    op.drop_table("ingest_checkpoints")
@@ -0,0 +1,72 @@
+"""student test rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "student_test_rollups",
+        sa.Column("student_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("students.id"), primary_key=True),
+        sa.Column("test_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("tests.id"), primary_key=True),
+        sa.Column("attempt_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("deduped_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("scored_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("best_score", sa.Integer()),
+        sa.Column("best_accuracy", sa.Integer()),
+        sa.Column("best_attempt_id", postgresql.UUID(as_uuid=True)),
+        sa.Column("latest_score", sa.Integer()),
+        sa.Column("latest_attempt_id", postgresql.UUID(as_uuid=True)),
+        sa.Column("latest_submitted_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+    # backfill from existing attempts, same rules as app/rollups.py
+    op.execute(
+        """
+        INSERT INTO student_test_rollups (
+            student_id, test_id, attempt_count, deduped_count,
+            scored_count, score_sum, best_score, best_accuracy,
+            best_attempt_id, latest_score, latest_attempt_id,
+            latest_submitted_at, updated_at
+        )
+        SELECT
+            a.student_id,
+            a.test_id,
+            count(*),
+            count(*) FILTER (WHERE a.status = 'DEDUPED'),
+            count(*) FILTER (WHERE a.status = 'SCORED' AND s.score IS NOT NULL),
+            coalesce(sum(s.score) FILTER (WHERE a.status = 'SCORED'), 0),
+            max(s.score) FILTER (WHERE a.status = 'SCORED'),
+            max(s.accuracy) FILTER (WHERE a.status = 'SCORED'),
+            (array_agg(a.id ORDER BY s.score DESC, a.id ASC)
+                FILTER (WHERE a.status = 'SCORED' AND s.score IS NOT NULL))[1],
+            (array_agg(s.score ORDER BY coalesce(a.submitted_at, a.started_at) DESC NULLS LAST, a.id DESC)
+                FILTER (WHERE a.status = 'SCORED' AND s.score IS NOT NULL))[1],
+            (array_agg(a.id ORDER BY coalesce(a.submitted_at, a.started_at) DESC NULLS LAST, a.id DESC)
+                FILTER (WHERE a.status = 'SCORED' AND s.score IS NOT NULL))[1],
+            max(coalesce(a.submitted_at, a.started_at))
+                FILTER (WHERE a.status = 'SCORED' AND s.score IS NOT NULL),
+            now()
+        FROM attempts a
+        LEFT JOIN attempt_scores s ON s.attempt_id = a.id
+        WHERE a.student_id IS NOT NULL AND a.test_id IS NOT NULL
+        GROUP BY a.student_id, a.test_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("student_test_rollups")
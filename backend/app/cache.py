@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import OrderedDict
+
+from . import models
+
+
+TEST_CACHE_SIZE = int(os.getenv("TEST_CACHE_SIZE", "1000"))
+IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "10000"))
+
+
+class LRUCache:
+    """
+    Thread-safe size-bounded mapping, least recently used entries go first.
+    """
+
+    def __init__(self, max_size: int):
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self.max_size = max_size
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TestCache:
+    """
+    In-process cache of test marking configs keyed by test id.
+    """
+
+    def __init__(self, max_size: int = TEST_CACHE_SIZE):
+        self._tests = LRUCache(max_size)
+
+    def get(self, test_id):
+        return self._tests.get(str(test_id))
+
+    @staticmethod
+    def entry_for(test) -> dict:
+        # plain values, safe to keep after the session is closed
+        return {
+            "test_id": str(test.id),
+            "name": test.name,
+            "max_marks": test.max_marks,
+            "negative_marking": test.negative_marking or {},
+        }
+
+    def put(self, test):
+        return self.put_entry(self.entry_for(test))
+
+    def put_entry(self, entry):
+        self._tests.put(entry["test_id"], entry)
+        return entry
+
+    def load(self, db):
+        # only the most recent tests, the rest are loaded on demand
+        tests = (
+            db.query(models.Test)
+            .order_by(models.Test.created_at.desc())
+            .limit(self._tests.max_size)
+            .all()
+        )
+        for test in reversed(tests):
+            self.put(test)
+        return len(tests)
+
+    def __len__(self):
+        return len(self._tests)
+
+
+class IdentityCache:
+    """
+    In-process cache of normalized identity_key -> student id.
+    """
+
+    def __init__(self, max_size: int = IDENTITY_CACHE_SIZE):
+        self._students = LRUCache(max_size)
+
+    def get(self, identity_key):
+        if identity_key is None:
+            return None
+        return self._students.get(identity_key)
+
+    def put(self, identity_key, student_id):
+        if identity_key is None:
+            return
+        self._students.put(identity_key, student_id)
+
+    def load(self, db):
+        # most recently created students are the likeliest to submit again
+        rows = (
+            db.query(models.Student.identity_key, models.Student.id)
+            .filter(models.Student.identity_key.isnot(None))
+            .order_by(models.Student.created_at.desc())
+            .limit(self._students.max_size)
+            .all()
+        )
+        for identity_key, student_id in reversed(rows):
+            self._students.put(identity_key, student_id)
+        return len(rows)
+
+    def __len__(self):
+        return len(self._students)
+
+
+test_cache = TestCache()
+identity_cache = IdentityCache()
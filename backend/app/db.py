@@ -7,7 +7,35 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
 
 Base = declarative_base()
+
+_engine = None
+_session_factory = sessionmaker()
+
+
+def get_engine():
+    """
+    Creates the engine on first use instead of at import time,
+    so importing the app (or alembic) never opens a connection.
+    """
+
+    global _engine
+
+    if _engine is None:
+        _engine = create_engine(
+            DATABASE_URL,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_pre_ping=True,
+        )
+        _session_factory.configure(bind=_engine)
+
+    return _engine
+
+
+def SessionLocal():
+    get_engine()
+    return _session_factory()
@@ -0,0 +1,230 @@
+import math
+from datetime import datetime
+
+from . import models
+
+
+# Distributions are kept per test_id. Ingest currently creates one Test
+# row per event, so until tests are shared across attempts each
+# distribution holds a single score.
+
+
+NUM_BINS = 20
+
+QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+def bin_width_for(max_marks: int | None) -> int:
+    """
+    Fixed bin width for a test, so ~NUM_BINS bins cover [0, max_marks].
+    Negative scores simply fall into negative bin indexes.
+    """
+
+    if not max_marks or max_marks <= 0:
+        return 1
+
+    return max(1, math.ceil(max_marks / NUM_BINS))
+
+
+def _bin_index(score: int, width: int) -> int:
+    return score // width
+
+
+def _bump(counts: dict | None, key, delta: int) -> dict:
+    # JSONB columns only notice reassignment, so always return a new dict
+    counts = dict(counts or {})
+    key = str(key)
+    value = counts.get(key, 0) + delta
+
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+    return counts
+
+
+def _get_or_create(db, test_id, max_marks):
+    dist = (
+        db.query(models.ScoreDistribution)
+        .filter_by(test_id=test_id)
+        .with_for_update()
+        .first()
+    )
+
+    if not dist:
+        dist = models.ScoreDistribution(
+            test_id=test_id,
+            bin_width=bin_width_for(max_marks),
+            count=0,
+            total=0,
+            histogram={},
+            sketch={},
+        )
+        db.add(dist)
+
+    return dist
+
+
+def add_score(db, test_id, max_marks, score: int):
+    """
+    Adds one scored attempt to the test distribution.
+    Caller owns the transaction.
+    """
+
+    if score is None:
+        return
+
+    dist = _get_or_create(db, test_id, max_marks)
+
+    dist.count += 1
+    dist.total += score
+    dist.histogram = _bump(dist.histogram, _bin_index(score, dist.bin_width), 1)
+    dist.sketch = _bump(dist.sketch, score, 1)
+    dist.updated_at = datetime.utcnow()
+
+
+def remove_score(db, test_id, score: int):
+    if score is None:
+        return
+
+    dist = (
+        db.query(models.ScoreDistribution)
+        .filter_by(test_id=test_id)
+        .with_for_update()
+        .first()
+    )
+
+    if not dist or str(score) not in (dist.sketch or {}):
+        return
+
+    dist.count -= 1
+    dist.total -= score
+    dist.histogram = _bump(dist.histogram, _bin_index(score, dist.bin_width), -1)
+    dist.sketch = _bump(dist.sketch, score, -1)
+    dist.updated_at = datetime.utcnow()
+
+
+def rebuild(db, test_id, max_marks):
+    """
+    Recomputes a test distribution from its scored attempts.
+    Used to backfill tests scored before the distribution existed.
+    """
+
+    # lock (or create) the row first, so an add_score that commits while
+    # we aggregate waits for us instead of being overwritten
+    dist = _get_or_create(db, test_id, max_marks)
+    db.flush()
+
+    scores = (
+        db.query(models.AttemptScore.score)
+        .join(models.Attempt, models.Attempt.id == models.AttemptScore.attempt_id)
+        .filter(
+            models.Attempt.test_id == test_id,
+            models.Attempt.status == "SCORED",
+            models.AttemptScore.score.isnot(None),
+        )
+        .all()
+    )
+
+    width = bin_width_for(max_marks)
+
+    histogram = {}
+    sketch = {}
+
+    for (score,) in scores:
+        histogram = _bump(histogram, _bin_index(score, width), 1)
+        sketch = _bump(sketch, score, 1)
+
+    dist.bin_width = width
+    dist.count = len(scores)
+    dist.total = sum(score for (score,) in scores)
+    dist.histogram = histogram
+    dist.sketch = sketch
+    dist.updated_at = datetime.utcnow()
+
+    return dist
+
+
+def _sorted_sketch(dist):
+    return sorted((int(k), v) for k, v in (dist.sketch or {}).items())
+
+
+def quantile(dist, q: float):
+    """
+    Returns the score at quantile q (0..1) from the sketch.
+    """
+
+    if not dist or not dist.count:
+        return None
+
+    target = q * (dist.count - 1)
+    seen = 0
+
+    for score, count in _sorted_sketch(dist):
+        seen += count
+        if seen > target:
+            return score
+
+    return None
+
+
+def percentile_of(dist, score: int):
+    """
+    Mid-rank percentile: share of scores below `score`
+    plus half of the scores equal to it.
+    """
+
+    if not dist or not dist.count:
+        return None
+
+    below = 0
+    equal = 0
+
+    for value, count in _sorted_sketch(dist):
+        if value < score:
+            below += count
+        elif value == score:
+            equal = count
+        else:
+            break
+
+    return round((below + equal / 2) / dist.count * 100, 2)
+
+
+def summarize(dist) -> dict:
+    if not dist or not dist.count:
+        return {
+            "count": 0,
+            "mean": None,
+            "median": None,
+            "min": None,
+            "max": None,
+            "bin_width": dist.bin_width if dist else None,
+            "histogram": [],
+            "quantiles": {},
+        }
+
+    sketch = _sorted_sketch(dist)
+
+    histogram = [
+        {
+            "lower": index * dist.bin_width,
+            "upper": (index + 1) * dist.bin_width,
+            "count": count,
+        }
+        for index, count in sorted(
+            (int(k), v) for k, v in dist.histogram.items()
+        )
+    ]
+
+    return {
+        "count": dist.count,
+        "mean": round(dist.total / dist.count, 2),
+        "median": quantile(dist, 0.5),
+        "min": sketch[0][0],
+        "max": sketch[-1][0],
+        "bin_width": dist.bin_width,
+        "histogram": histogram,
+        "quantiles": {f"p{int(q * 100)}": quantile(dist, q) for q in QUANTILES},
+    }
@@ -0,0 +1,139 @@
+from . import models
+from . import distribution
+from . import rollups
+from .scoring import compute_score
+from .identity import get_student_identity
+from .dedup import find_duplicate_attempt
+from .cache import test_cache, identity_cache
+from .logging_config import get_logger
+
+
+scoring_logger = get_logger("scoring")
+dedup_logger = get_logger("dedup")
+
+
+def ingest_event(db, raw, event):
+    """
+    Ingests one validated attempt event (see schemas.validate_events):
+    resolves the student, creates the test and attempt, runs dedup and
+    scoring. Only flushes; the caller owns the transaction and should
+    pass the result to remember_ingested() once it has committed.
+    """
+
+    student_data = event.student
+
+    identity_key = get_student_identity(
+        student_data.email,
+        student_data.phone,
+    )
+
+    student_id = identity_cache.get(identity_key)
+
+    if not student_id:
+        student = db.query(models.Student).filter_by(
+            identity_key=identity_key
+        ).first()
+
+        if not student:
+            student = models.Student(
+                full_name=student_data.full_name,
+                email=student_data.email,
+                phone=student_data.phone,
+                identity_key=identity_key,
+            )
+            db.add(student)
+            db.flush()
+
+        student_id = student.id
+
+    test_data = event.test
+
+    test = models.Test(
+        name=test_data.name,
+        max_marks=test_data.max_marks,
+        negative_marking=test_data.negative_marking.model_dump(),
+    )
+    db.add(test)
+    db.flush()
+
+    attempt = models.Attempt(
+        student_id=student_id,
+        test_id=test.id,
+        source_event_id=event.source_event_id,
+        started_at=event.started_at,
+        submitted_at=event.submitted_at,
+        answers=event.answers,
+        raw_payload=raw,
+        status="INGESTED",
+    )
+
+    db.add(attempt)
+    db.flush()
+
+    existing_attempts = db.query(models.Attempt).filter(
+        models.Attempt.student_id == student_id,
+        models.Attempt.test_id == test.id,
+        models.Attempt.id != attempt.id,
+    ).all()
+
+    duplicate = find_duplicate_attempt(attempt, existing_attempts)
+
+    if duplicate:
+        attempt.status = "DEDUPED"
+        attempt.duplicate_of_attempt_id = duplicate.id
+        dedup_logger.info(
+            "Duplicate detected",
+            extra={
+                "context": {"attempt_id": str(attempt.id)},
+                "extra": {"duplicate_of": str(duplicate.id)},
+            },
+        )
+    else:
+        attempt.status = "SCORED"
+
+    correct, wrong, skipped, accuracy, net_correct, score, explanation = compute_score(
+        attempt.answers or {}, test.negative_marking or {}
+    )
+
+    attempt_score = models.AttemptScore(
+        attempt_id=attempt.id,
+        correct=correct,
+        wrong=wrong,
+        skipped=skipped,
+        accuracy=accuracy,
+        net_correct=net_correct,
+        score=score,
+        explanation=explanation,
+    )
+
+    db.add(attempt_score)
+
+    if attempt.status == "SCORED":
+        distribution.add_score(db, test.id, test.max_marks, score)
+
+    rollups.record_attempt(db, attempt, score, accuracy)
+
+    db.flush()
+
+    scoring_logger.info(
+        "Scoring completed",
+        extra={
+            "context": {"attempt_id": str(attempt.id)},
+            "extra": {"score": score},
+        },
+    )
+
+    # plain values only, the ORM objects expire on commit
+    return {
+        "identity_key": identity_key,
+        "student_id": student_id,
+        "test": test_cache.entry_for(test),
+        "attempt_id": attempt.id,
+        "source_event_id": attempt.source_event_id,
+    }
+
+
+def remember_ingested(result):
+    # Only called after commit, so the caches never point at rolled back rows
+    identity_cache.put(result["identity_key"], result["student_id"])
+    test_cache.put_entry(result["test"])
@@ -6,11 +6,16 @@ from uuid import UUID
 
 from fastapi import FastAPI, Query, Request, HTTPException
 
-from .db import engine, Base, SessionLocal
+from .db import SessionLocal
 from . import models
+from .cache import test_cache, identity_cache
+from .warmup import run_warmup, start_retry_loop, is_ready, last_error
 from .scoring import compute_score
-from .identity import get_student_identity
-from .dedup import find_duplicate_attempt
+from .ingest import ingest_event, remember_ingested
+from .schemas import validate_events
+from . import tail
+from . import distribution
+from . import rollups
 from .logging_config import get_logger
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -35,16 +40,28 @@ app.add_middleware(
 )
 
 http_logger = get_logger("http")
-scoring_logger = get_logger("scoring")
-dedup_logger = get_logger("dedup")
 
 
 # -----------------------
 # STARTUP
 # -----------------------
+# Schema is managed by alembic migrations (`alembic upgrade head`),
+# workers only warm the pool and caches.
 @app.on_event("startup")
 def startup():
-    Base.metadata.create_all(bind=engine)
+    if not run_warmup():
+        start_retry_loop()
+
+    watch_path = os.getenv("INGEST_WATCH_PATH")
+    if watch_path:
+        app.state.tail_stop = tail.start_background(watch_path)
+
+
+@app.on_event("shutdown")
+def shutdown():
+    stop_event = getattr(app.state, "tail_stop", None)
+    if stop_event:
+        stop_event.set()
 
 
 # -----------------------
@@ -83,6 +100,26 @@ def home():
     return {"message": "Backend + PostgreSQL connected successfully!"}
 
 
+@app.get("/health/live")
+def liveness():
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+def readiness():
+    if not is_ready():
+        raise HTTPException(
+            status_code=503,
+            detail={"status": "warming_up", "error": last_error()},
+        )
+
+    return {
+        "status": "ready",
+        "cached_tests": len(test_cache),
+        "cached_identities": len(identity_cache),
+    }
+
+
 # -----------------------
 # LOAD JSON (INGESTION)
 # -----------------------
@@ -97,121 +134,30 @@ def load_json():
         with open(file_path, "r") as f:
             data = json.load(f)
 
-        for event in data:
-            try:
-                student_data = event.get("student", {})
-
-                identity_key = get_student_identity(
-                    student_data.get("email"),
-                    student_data.get("phone"),
-                )
-
-                student = db.query(models.Student).filter_by(
-                    identity_key=identity_key
-                ).first()
-
-                if not student:
-                    student = models.Student(
-                        full_name=student_data.get("full_name"),
-                        email=student_data.get("email"),
-                        phone=student_data.get("phone"),
-                        identity_key=identity_key,
-                    )
-                    db.add(student)
-                    db.commit()
-                    db.refresh(student)
-
-                test_data = event.get("test", {})
-
-                test = models.Test(
-                    name=test_data.get("name"),
-                    max_marks=test_data.get("max_marks"),
-                    negative_marking=test_data.get("negative_marking"),
-                )
-                db.add(test)
-                db.commit()
-                db.refresh(test)
-
-                def parse_ts(value):
-                    if not value:
-                        return None
-                    try:
-                        return datetime.fromisoformat(value.replace("Z", ""))
-                    except:
-                        return None
-
-                started_at = parse_ts(event.get("started_at"))
-                submitted_at = parse_ts(event.get("submitted_at"))
-
-                attempt = models.Attempt(
-                    student_id=student.id,
-                    test_id=test.id,
-                    source_event_id=event.get("source_event_id"),
-                    started_at=started_at,
-                    submitted_at=submitted_at,
-                    answers=event.get("answers"),
-                    raw_payload=event,
-                    status="INGESTED",
-                )
+        valid, quarantine = validate_events(data)
 
-                db.add(attempt)
-                db.commit()
-                db.refresh(attempt)
-
-                existing_attempts = db.query(models.Attempt).filter(
-                    models.Attempt.student_id == student.id,
-                    models.Attempt.test_id == test.id,
-                    models.Attempt.id != attempt.id,
-                ).all()
-
-                duplicate = find_duplicate_attempt(attempt, existing_attempts)
-
-                if duplicate:
-                    attempt.status = "DEDUPED"
-                    attempt.duplicate_of_attempt_id = duplicate.id
-                    dedup_logger.info(
-                        "Duplicate detected",
-                        extra={
-                            "context": {"attempt_id": str(attempt.id)},
-                            "extra": {"duplicate_of": str(duplicate.id)},
-                        },
-                    )
-                else:
-                    attempt.status = "SCORED"
+        ingested = 0
+        failed = 0
 
+        for raw, event in valid:
+            try:
+                result = ingest_event(db, raw, event)
                 db.commit()
-
-                correct, wrong, skipped, accuracy, net_correct, score, explanation = compute_score(
-                    attempt.answers or {}, test.negative_marking or {}
-                )
-
-                attempt_score = models.AttemptScore(
-                    attempt_id=attempt.id,
-                    correct=correct,
-                    wrong=wrong,
-                    skipped=skipped,
-                    accuracy=accuracy,
-                    net_correct=net_correct,
-                    score=score,
-                    explanation=explanation,
-                )
-
-                db.add(attempt_score)
-                db.commit()
-
-                scoring_logger.info(
-                    "Scoring completed",
-                    extra={
-                        "context": {"attempt_id": str(attempt.id)},
-                        "extra": {"score": score},
-                    },
-                )
+                remember_ingested(result)
+                ingested += 1
 
             except Exception:
                 db.rollback()
+                failed += 1
                 continue
 
-        return {"message": "JSON loaded successfully"}
+        return {
+            "message": "JSON loaded successfully",
+            "ingested": ingested,
+            "failed": failed,
+            "quarantined": len(quarantine),
+            "quarantine": quarantine,
+        }
 
     finally:
         db.close()
@@ -423,6 +369,64 @@ def list_tests():
         db.close()
 
 
+# -----------------------
+# SCORE DISTRIBUTION
+# -----------------------
+@app.get("/api/tests/{test_id}/distribution")
+def get_distribution(test_id: UUID):
+    db = SessionLocal()
+
+    try:
+        if not db.query(models.Test.id).filter_by(id=test_id).first():
+            raise HTTPException(status_code=404, detail="Test not found")
+
+        dist = db.query(models.ScoreDistribution).filter_by(test_id=test_id).first()
+
+        return {"test_id": str(test_id), **distribution.summarize(dist)}
+
+    finally:
+        db.close()
+
+
+@app.get("/api/tests/{test_id}/percentile")
+def get_percentile(test_id: UUID, score: int):
+    db = SessionLocal()
+
+    try:
+        if not db.query(models.Test.id).filter_by(id=test_id).first():
+            raise HTTPException(status_code=404, detail="Test not found")
+
+        dist = db.query(models.ScoreDistribution).filter_by(test_id=test_id).first()
+
+        return {
+            "test_id": str(test_id),
+            "score": score,
+            "percentile": distribution.percentile_of(dist, score),
+            "count": dist.count if dist else 0,
+        }
+
+    finally:
+        db.close()
+
+
+@app.post("/api/tests/{test_id}/distribution/rebuild")
+def rebuild_distribution(test_id: UUID):
+    db = SessionLocal()
+
+    try:
+        test = db.query(models.Test).filter_by(id=test_id).first()
+        if not test:
+            raise HTTPException(status_code=404, detail="Test not found")
+
+        dist = distribution.rebuild(db, test.id, test.max_marks)
+        db.commit()
+
+        return {"test_id": str(test_id), **distribution.summarize(dist)}
+
+    finally:
+        db.close()
+
+
 # -----------------------
 # STUDENTS API
 # -----------------------
@@ -443,6 +447,31 @@ def list_students():
         db.close()
 
 
+# -----------------------
+# STUDENT HISTORY
+# -----------------------
+@app.get("/api/students/{student_id}/history")
+def student_history(student_id: UUID):
+    db = SessionLocal()
+
+    try:
+        rows = (
+            db.query(models.StudentTestRollup, models.Test.name)
+            .join(models.Test, models.StudentTestRollup.test_id == models.Test.id)
+            .filter(models.StudentTestRollup.student_id == student_id)
+            .order_by(models.StudentTestRollup.latest_submitted_at.desc().nullslast())
+            .all()
+        )
+
+        return {
+            "student_id": str(student_id),
+            "tests": [rollups.to_dict(rollup, test_name) for rollup, test_name in rows],
+        }
+
+    finally:
+        db.close()
+
+
 # -----------------------
 # FLAGS LIST
 # -----------------------
@@ -495,20 +524,40 @@ def recompute_attempt(attempt_id: UUID):
     db = SessionLocal()
 
     try:
-        attempt = db.query(models.Attempt).filter_by(id=attempt_id).first()
+        # lock the attempt and its score so concurrent recomputes of the
+        # same attempt don't both apply the status/score transition
+        attempt = (
+            db.query(models.Attempt)
+            .filter_by(id=attempt_id)
+            .with_for_update()
+            .first()
+        )
         if not attempt:
             raise HTTPException(status_code=404, detail="Attempt not found")
 
-        test = db.query(models.Test).filter_by(id=attempt.test_id).first()
-        score = db.query(models.AttemptScore).filter_by(
-            attempt_id=attempt.id
-        ).first()
+        test = test_cache.get(attempt.test_id)
+        if not test:
+            test = test_cache.put(
+                db.query(models.Test).filter_by(id=attempt.test_id).first()
+            )
+
+        score = (
+            db.query(models.AttemptScore)
+            .filter_by(attempt_id=attempt.id)
+            .with_for_update()
+            .first()
+        )
 
         correct, wrong, skipped, accuracy, net_correct, new_score, explanation = compute_score(
             attempt.answers or {},
-            test.negative_marking or {},
+            test["negative_marking"],
         )
 
+        if attempt.status == "SCORED":
+            distribution.remove_score(db, attempt.test_id, score.score)
+
+        distribution.add_score(db, attempt.test_id, test["max_marks"], new_score)
+
         score.correct = correct
         score.wrong = wrong
         score.skipped = skipped
@@ -520,6 +569,8 @@ def recompute_attempt(attempt_id: UUID):
 
         attempt.status = "SCORED"
 
+        rollups.rebuild(db, attempt.student_id, attempt.test_id)
+
         db.commit()
 
         return {"message": "Recomputed successfully"}
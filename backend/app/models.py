@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from .db import Base
 
@@ -35,7 +35,7 @@ class Attempt(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"))
     test_id = Column(UUID(as_uuid=True), ForeignKey("tests.id"))
-    source_event_id = Column(String)
+    source_event_id = Column(String, index=True)
     started_at = Column(DateTime)
     submitted_at = Column(DateTime)
     answers = Column(JSONB)
@@ -64,3 +64,46 @@ class Flag(Base):
     attempt_id = Column(UUID(as_uuid=True), ForeignKey("attempts.id"))
     reason = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ScoreDistribution(Base):
+    __tablename__ = "score_distributions"
+
+    test_id = Column(UUID(as_uuid=True), ForeignKey("tests.id"), primary_key=True)
+    bin_width = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=False, default=0)
+    # bin index -> count, bin i covers [i * bin_width, (i + 1) * bin_width)
+    histogram = Column(JSONB, nullable=False, default=dict)
+    # score -> count, exact since scores are bounded integers
+    sketch = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class IngestCheckpoint(Base):
+    __tablename__ = "ingest_checkpoints"
+
+    # watched file or directory
+    source = Column(String, primary_key=True)
+    file_name = Column(String)
+    offset = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class StudentTestRollup(Base):
+    __tablename__ = "student_test_rollups"
+
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"), primary_key=True)
+    test_id = Column(UUID(as_uuid=True), ForeignKey("tests.id"), primary_key=True)
+    attempt_count = Column(Integer, nullable=False, default=0)
+    deduped_count = Column(Integer, nullable=False, default=0)
+    # scores only cover SCORED (canonical) attempts
+    scored_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    best_score = Column(Integer)
+    best_accuracy = Column(Integer)
+    best_attempt_id = Column(UUID(as_uuid=True))
+    latest_score = Column(Integer)
+    latest_attempt_id = Column(UUID(as_uuid=True))
+    latest_submitted_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,144 @@
+from datetime import datetime
+
+from . import models
+
+
+def _attempt_time(attempt):
+    return attempt.submitted_at or attempt.started_at
+
+
+def _latest_key(attempted_at, attempt_id):
+    # newest time wins, untimed attempts lose, ties go to the higher id
+    # (same as ORDER BY time DESC NULLS LAST, id DESC in migration 0004)
+    return (attempted_at is not None, attempted_at or datetime.min, attempt_id)
+
+
+def _get_or_create(db, student_id, test_id):
+    rollup = (
+        db.query(models.StudentTestRollup)
+        .filter_by(student_id=student_id, test_id=test_id)
+        .with_for_update()
+        .first()
+    )
+
+    if not rollup:
+        rollup = models.StudentTestRollup(
+            student_id=student_id,
+            test_id=test_id,
+            attempt_count=0,
+            deduped_count=0,
+            scored_count=0,
+            score_sum=0,
+        )
+        db.add(rollup)
+
+    return rollup
+
+
+def _apply_score(rollup, attempt, score, accuracy):
+    rollup.scored_count += 1
+    rollup.score_sum += score
+
+    # highest score wins, ties go to the lower id
+    # (same as ORDER BY score DESC, id ASC in migration 0004)
+    if (
+        rollup.best_score is None
+        or score > rollup.best_score
+        or (score == rollup.best_score and attempt.id < rollup.best_attempt_id)
+    ):
+        rollup.best_score = score
+        rollup.best_attempt_id = attempt.id
+
+    if accuracy is not None and (rollup.best_accuracy is None or accuracy > rollup.best_accuracy):
+        rollup.best_accuracy = accuracy
+
+    attempted_at = _attempt_time(attempt)
+
+    if rollup.latest_attempt_id is None or _latest_key(attempted_at, attempt.id) > _latest_key(
+        rollup.latest_submitted_at, rollup.latest_attempt_id
+    ):
+        rollup.latest_score = score
+        rollup.latest_attempt_id = attempt.id
+        rollup.latest_submitted_at = attempted_at
+
+
+def record_attempt(db, attempt, score, accuracy):
+    """
+    Adds a newly ingested attempt to its (student, test) rollup.
+    Caller owns the transaction.
+    """
+
+    rollup = _get_or_create(db, attempt.student_id, attempt.test_id)
+
+    rollup.attempt_count += 1
+
+    if attempt.status == "DEDUPED":
+        rollup.deduped_count += 1
+    elif attempt.status == "SCORED" and score is not None:
+        _apply_score(rollup, attempt, score, accuracy)
+
+    rollup.updated_at = datetime.utcnow()
+
+    return rollup
+
+
+def rebuild(db, student_id, test_id):
+    """
+    Recomputes one (student, test) rollup from its attempts.
+    Used by recompute, where a score can go down and best/latest
+    can't be maintained incrementally.
+    """
+
+    rows = (
+        db.query(models.Attempt, models.AttemptScore)
+        .outerjoin(models.AttemptScore, models.AttemptScore.attempt_id == models.Attempt.id)
+        .filter(
+            models.Attempt.student_id == student_id,
+            models.Attempt.test_id == test_id,
+        )
+        .all()
+    )
+
+    rollup = _get_or_create(db, student_id, test_id)
+
+    rollup.attempt_count = 0
+    rollup.deduped_count = 0
+    rollup.scored_count = 0
+    rollup.score_sum = 0
+    rollup.best_score = None
+    rollup.best_accuracy = None
+    rollup.best_attempt_id = None
+    rollup.latest_score = None
+    rollup.latest_attempt_id = None
+    rollup.latest_submitted_at = None
+
+    for attempt, score in rows:
+        rollup.attempt_count += 1
+
+        if attempt.status == "DEDUPED":
+            rollup.deduped_count += 1
+        elif attempt.status == "SCORED" and score and score.score is not None:
+            _apply_score(rollup, attempt, score.score, score.accuracy)
+
+    rollup.updated_at = datetime.utcnow()
+
+    return rollup
+
+
+def to_dict(rollup, test_name=None) -> dict:
+    return {
+        "test_id": str(rollup.test_id),
+        "test_name": test_name,
+        "attempt_count": rollup.attempt_count,
+        "deduped_count": rollup.deduped_count,
+        "scored_count": rollup.scored_count,
+        "best_score": rollup.best_score,
+        "best_accuracy": rollup.best_accuracy,
+        "best_attempt_id": str(rollup.best_attempt_id) if rollup.best_attempt_id else None,
+        "latest_score": rollup.latest_score,
+        "latest_attempt_id": str(rollup.latest_attempt_id) if rollup.latest_attempt_id else None,
+        "latest_submitted_at": rollup.latest_submitted_at,
+        "average_score": round(rollup.score_sum / rollup.scored_count, 2)
+        if rollup.scored_count
+        else None,
+    }
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    TypeAdapter,
+    ValidationError,
+    model_validator,
+)
+
+
+VALIDATION_CHUNK_SIZE = 500
+
+
+def _to_naive_utc(value: datetime | None) -> datetime | None:
+    # attempts store naive UTC timestamps
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# pydantic parses ISO-8601 strings natively, no per-event Python parsing
+Timestamp = Annotated[datetime | None, AfterValidator(_to_naive_utc)]
+
+
+class EventStudent(BaseModel):
+    full_name: str
+    email: str | None = None
+    phone: str | None = None
+
+    @model_validator(mode="after")
+    def require_contact(self):
+        if not self.email and not self.phone:
+            raise ValueError("student needs an email or a phone")
+        return self
+
+
+class MarkingScheme(BaseModel):
+    correct: int
+    wrong: int
+    skip: int
+
+
+class EventTest(BaseModel):
+    name: str
+    max_marks: int | None = None
+    negative_marking: MarkingScheme
+
+
+class AttemptEvent(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    source_event_id: str | None = None
+    student: EventStudent
+    test: EventTest
+    started_at: Timestamp = None
+    submitted_at: Timestamp = None
+    answers: dict[str, str] | None = None
+
+    @model_validator(mode="after")
+    def check_order(self):
+        if self.started_at and self.submitted_at and self.submitted_at < self.started_at:
+            raise ValueError("submitted_at is before started_at")
+        return self
+
+
+_events_adapter = TypeAdapter(list[AttemptEvent])
+
+
+def _error_reasons(errors: list) -> list:
+    return [
+        {
+            "field": ".".join(str(part) for part in error["loc"]) or None,
+            "message": error["msg"],
+            "type": error["type"],
+        }
+        for error in errors
+    ]
+
+
+def _quarantine_entry(index: int, raw, errors: list) -> dict:
+    return {
+        "index": index,
+        "source_event_id": raw.get("source_event_id") if isinstance(raw, dict) else None,
+        "reasons": _error_reasons(errors),
+    }
+
+
+def validate_events(raw_events: list, chunk_size: int = VALIDATION_CHUNK_SIZE):
+    """
+    Validates raw events in chunks before any database work.
+
+    Returns (valid, quarantine): valid is a list of (raw, AttemptEvent)
+    pairs, quarantine lists rejected events with structured reasons.
+    """
+
+    valid = []
+    quarantine = []
+
+    if not isinstance(raw_events, list):
+        quarantine.append({
+            "index": None,
+            "source_event_id": None,
+            "reasons": [{
+                "field": None,
+                "message": "Expected a list of events at the top level",
+                "type": "list_type",
+            }],
+        })
+        return valid, quarantine
+
+    for start in range(0, len(raw_events), chunk_size):
+        chunk = raw_events[start:start + chunk_size]
+
+        try:
+            parsed = _events_adapter.validate_python(chunk)
+            valid.extend(zip(chunk, parsed))
+            continue
+        except ValidationError as exc:
+            errors_by_index = {}
+            for error in exc.errors(include_url=False, include_input=False):
+                index, *loc = error["loc"]
+                errors_by_index.setdefault(index, []).append({**error, "loc": tuple(loc)})
+
+        good = [raw for i, raw in enumerate(chunk) if i not in errors_by_index]
+        valid.extend(zip(good, _events_adapter.validate_python(good)))
+
+        for i, errors in sorted(errors_by_index.items()):
+            quarantine.append(_quarantine_entry(start + i, chunk[i], errors))
+
+    return valid, quarantine
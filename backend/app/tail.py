@@ -0,0 +1,486 @@
+"""
+Incremental ingestion of NDJSON attempt events.
+
+Watches a single file or a directory of *.ndjson / *.jsonl files and
+ingests only what was appended since the last persisted checkpoint
+(file + byte offset). Lines are micro-batched and each batch is
+committed together with its checkpoint, so a crash replays at most one
+batch, and replayed events are dropped by source_event_id.
+
+Run standalone with `python -m app.tail <path>`, or set
+INGEST_WATCH_PATH to start it inside the API process.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from .db import SessionLocal
+from . import models
+from .ingest import ingest_event, remember_ingested
+from .schemas import validate_events
+from .logging_config import get_logger
+
+
+BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+BATCH_SECONDS = float(os.getenv("INGEST_BATCH_SECONDS", "2"))
+POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", "0.5"))
+RECENT_WINDOW = int(os.getenv("INGEST_RECENT_WINDOW", "10000"))
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+ingest_logger = get_logger("ingest")
+
+
+class RecentWindow:
+    """
+    Bounded set of the most recently ingested source_event_ids.
+    """
+
+    def __init__(self, size: int = RECENT_WINDOW):
+        self._order = deque()
+        self._seen = set()
+        self._size = size
+
+    def __contains__(self, event_id):
+        return event_id in self._seen
+
+    def add(self, event_id):
+        if event_id is None or event_id in self._seen:
+            return
+
+        self._order.append(event_id)
+        self._seen.add(event_id)
+
+        if len(self._order) > self._size:
+            self._seen.discard(self._order.popleft())
+
+
+class Tailer:
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = BATCH_SIZE,
+        batch_seconds: float = BATCH_SECONDS,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.path = os.path.abspath(path)
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self.poll_interval = poll_interval
+
+        self.recent = RecentWindow()
+
+        # position persisted in ingest_checkpoints as last seen by this
+        # watcher; None until loaded or while no row exists
+        self.checkpoint = None
+        self._checkpoint_loaded = False
+
+        # local read position: the buffer starts at offset and ends at
+        # read_offset. It can move away from the checkpoint (truncation,
+        # removed file) and is persisted by the next flush.
+        self.file_name = None
+        self.offset = 0
+        self.read_offset = 0
+        self.buffer = []
+        self.buffer_started = None
+
+    # -----------------------
+    # Files
+    # -----------------------
+    def _is_dir(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def _files(self) -> list:
+        if self._is_dir():
+            return sorted(
+                name for name in os.listdir(self.path)
+                if name.endswith(NDJSON_SUFFIXES)
+            )
+
+        if os.path.exists(self.path):
+            return [os.path.basename(self.path)]
+
+        return []
+
+    def _file_path(self, name: str) -> str:
+        if self._is_dir():
+            return os.path.join(self.path, name)
+        return self.path
+
+    def _next_file(self, files: list):
+        later = [name for name in files if name > self.file_name]
+        return later[0] if later else None
+
+    # -----------------------
+    # Checkpoint
+    # -----------------------
+    def _load_checkpoint(self):
+        # called from the poll loop, so a database outage at boot is retried
+        db = SessionLocal()
+
+        try:
+            checkpoint = db.query(models.IngestCheckpoint).filter_by(
+                source=self.path
+            ).first()
+            position = (checkpoint.file_name, checkpoint.offset) if checkpoint else None
+        finally:
+            db.close()
+
+        self.checkpoint = position
+        self._checkpoint_loaded = True
+
+        if position:
+            self._reset_to(*position)
+
+    def _reset_to(self, file_name, offset):
+        self.file_name = file_name
+        self.offset = offset or 0
+        self.read_offset = self.offset
+        self.buffer = []
+        self.buffer_started = None
+
+    # -----------------------
+    # Reading
+    # -----------------------
+    def _read_new_lines(self) -> int:
+        """
+        Buffers complete lines appended after read_offset.
+        A trailing line without a newline is left for the next poll.
+        """
+
+        file_path = self._file_path(self.file_name)
+
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return 0
+
+        if size < self.read_offset:
+            ingest_logger.warning(
+                "File truncated, restarting from beginning",
+                extra={"extra": {"file": file_path, "offset": self.read_offset}},
+            )
+            self._reset_to(self.file_name, 0)
+
+        if size == self.read_offset:
+            return 0
+
+        read = 0
+
+        with open(file_path, "rb") as f:
+            f.seek(self.read_offset)
+
+            while len(self.buffer) < self.batch_size:
+                line = f.readline()
+
+                if not line or not line.endswith(b"\n"):
+                    break
+
+                self.read_offset += len(line)
+                line = line.strip()
+
+                if not line:
+                    continue
+
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    ingest_logger.warning(
+                        "Skipping malformed line",
+                        extra={"extra": {"file": file_path, "offset": self.read_offset}},
+                    )
+                    continue
+
+                if self.buffer_started is None:
+                    self.buffer_started = time.monotonic()
+
+                self.buffer.append(event)
+                read += 1
+
+        return read
+
+    def _read_final_line(self):
+        """
+        Buffers a last line that has no trailing newline. Only used when
+        leaving a finished file, where nothing will be appended anymore.
+        """
+
+        file_path = self._file_path(self.file_name)
+
+        try:
+            with open(file_path, "rb") as f:
+                f.seek(self.read_offset)
+                rest = f.read()
+        except OSError:
+            return
+
+        self.read_offset += len(rest)
+        rest = rest.strip()
+
+        if not rest:
+            return
+
+        try:
+            event = json.loads(rest)
+        except ValueError:
+            ingest_logger.warning(
+                "Dropping malformed final line",
+                extra={"extra": {"file": file_path, "offset": self.read_offset}},
+            )
+            return
+
+        if self.buffer_started is None:
+            self.buffer_started = time.monotonic()
+
+        self.buffer.append(event)
+
+    # -----------------------
+    # Batching
+    # -----------------------
+    def _batch_due(self) -> bool:
+        if len(self.buffer) >= self.batch_size:
+            return True
+
+        return (
+            self.buffer_started is not None
+            and time.monotonic() - self.buffer_started >= self.batch_seconds
+        )
+
+    def _dedup(self, db, events: list) -> tuple:
+        """
+        Drops events already seen in the recent window, repeated in the
+        batch, or already stored. Returns (fresh, ids found in the DB).
+        """
+
+        fresh = []
+        batch_ids = set()
+        existing = set()
+
+        for raw, event in events:
+            event_id = event.source_event_id
+
+            if event_id is not None:
+                if event_id in self.recent or event_id in batch_ids:
+                    continue
+                batch_ids.add(event_id)
+
+            fresh.append((raw, event))
+
+        if batch_ids:
+            existing = {
+                row[0]
+                for row in db.query(models.Attempt.source_event_id).filter(
+                    models.Attempt.source_event_id.in_(batch_ids)
+                )
+            }
+            fresh = [pair for pair in fresh if pair[1].source_event_id not in existing]
+
+        return fresh, existing
+
+    def _flush(self, next_file=None) -> int:
+        """
+        Ingests the buffer and advances the checkpoint in one transaction.
+        The checkpoint row is locked, so several watchers on the same
+        source never ingest the same bytes twice.
+        """
+
+        db = SessionLocal()
+        ingested = []
+
+        try:
+            checkpoint = (
+                db.query(models.IngestCheckpoint)
+                .filter_by(source=self.path)
+                .with_for_update()
+                .first()
+            )
+
+            if checkpoint is None:
+                checkpoint = models.IngestCheckpoint(
+                    source=self.path,
+                    file_name=self.file_name,
+                    offset=0,
+                )
+                db.add(checkpoint)
+            elif (checkpoint.file_name, checkpoint.offset) != self.checkpoint:
+                # another watcher got here first, pick up from its position
+                position = (checkpoint.file_name, checkpoint.offset)
+                db.rollback()
+                self.checkpoint = position
+                self._reset_to(*position)
+                return 0
+
+            valid, quarantine = validate_events(self.buffer)
+
+            for entry in quarantine:
+                ingest_logger.warning(
+                    "Event quarantined",
+                    extra={
+                        "context": {"source_event_id": entry["source_event_id"]},
+                        "extra": {"file": self.file_name, "reasons": entry["reasons"]},
+                    },
+                )
+
+            events, existing_ids = self._dedup(db, valid)
+            skipped = len(valid) - len(events)
+            failed = 0
+
+            for raw, event in events:
+                try:
+                    with db.begin_nested():
+                        ingested.append(ingest_event(db, raw, event))
+                except Exception as exc:
+                    failed += 1
+                    ingest_logger.warning(
+                        "Event failed",
+                        extra={
+                            "context": {"source_event_id": event.source_event_id},
+                            "extra": {"error": str(exc)},
+                        },
+                    )
+
+            if next_file:
+                checkpoint.file_name = next_file
+                checkpoint.offset = 0
+            else:
+                checkpoint.file_name = self.file_name
+                checkpoint.offset = self.read_offset
+
+            checkpoint.updated_at = datetime.utcnow()
+            position = (checkpoint.file_name, checkpoint.offset)
+
+            db.commit()
+
+        except Exception:
+            db.rollback()
+            raise
+
+        finally:
+            db.close()
+
+        self.checkpoint = position
+
+        # only ids that are stored now, a failed event may be re-sent
+        for event_id in existing_ids:
+            self.recent.add(event_id)
+
+        for result in ingested:
+            self.recent.add(result["source_event_id"])
+
+        for result in ingested:
+            remember_ingested(result)
+
+        if self.buffer or next_file:
+            ingest_logger.info(
+                "Batch ingested",
+                extra={
+                    "extra": {
+                        "file": self.file_name,
+                        "offset": position[1],
+                        "ingested": len(ingested),
+                        "duplicates": skipped,
+                        "quarantined": len(quarantine),
+                        "failed": failed,
+                    },
+                },
+            )
+
+        self._reset_to(*position)
+
+        return len(ingested)
+
+    # -----------------------
+    # Loop
+    # -----------------------
+    def poll_once(self) -> int:
+        if not self._checkpoint_loaded:
+            self._load_checkpoint()
+
+        files = self._files()
+
+        if not files:
+            return 0
+
+        if self.file_name is None:
+            self._reset_to(files[0], 0)
+        elif self.file_name not in files:
+            # checkpointed file was removed, continue with the next one
+            next_file = self._next_file(files)
+            if next_file is None:
+                return 0
+            self._reset_to(next_file, 0)
+
+        read = self._read_new_lines()
+
+        if self._batch_due():
+            return self._flush()
+
+        if read == 0 and self._is_dir():
+            next_file = self._next_file(files)
+            if next_file is not None:
+                # writers only append to the newest file, so move on
+                self._read_final_line()
+                return self._flush(next_file=next_file)
+
+        return 0
+
+    def run(self, stop_event: threading.Event):
+        ingest_logger.info(
+            "Tail ingestion started",
+            extra={"extra": {"source": self.path}},
+        )
+
+        while not stop_event.is_set():
+            try:
+                while self.poll_once():
+                    if stop_event.is_set():
+                        break
+            except Exception as exc:
+                ingest_logger.error(
+                    "Tail poll failed",
+                    extra={"extra": {"source": self.path, "error": str(exc)}},
+                )
+
+            stop_event.wait(self.poll_interval)
+
+        if self.buffer:
+            try:
+                self._flush()
+            except Exception as exc:
+                ingest_logger.error(
+                    "Final flush failed",
+                    extra={"extra": {"source": self.path, "error": str(exc)}},
+                )
+
+
+def start_background(path: str) -> threading.Event:
+    stop_event = threading.Event()
+
+    # Tailer() doesn't touch the database, the checkpoint is loaded
+    # inside run()'s retried poll loop
+    thread = threading.Thread(
+        target=lambda: Tailer(path).run(stop_event),
+        name="tail-ingest",
+        daemon=True,
+    )
+    thread.start()
+
+    return stop_event
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("usage: python -m app.tail <file-or-directory>")
+        sys.exit(1)
+
+    stop = threading.Event()
+
+    try:
+        Tailer(sys.argv[1]).run(stop)
+    except KeyboardInterrupt:
+        stop.set()
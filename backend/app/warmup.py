@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+
+from sqlalchemy import text
+
+from .db import get_engine, SessionLocal, POOL_SIZE
+from .cache import test_cache, identity_cache
+from .logging_config import get_logger
+
+
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", str(POOL_SIZE)))
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+
+startup_logger = get_logger("startup")
+
+_state = {"ready": False, "error": None}
+
+
+def warm_pool(n: int = WARMUP_CONNECTIONS) -> int:
+    """
+    Checks out n connections at once so the pool holds n open
+    connections before the first request arrives.
+    """
+
+    engine = get_engine()
+    connections = []
+
+    try:
+        for _ in range(n):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            connections.append(conn)
+    finally:
+        for conn in connections:
+            conn.close()
+
+    return len(connections)
+
+
+def preload_caches() -> dict:
+    db = SessionLocal()
+
+    try:
+        return {
+            "tests": test_cache.load(db),
+            "identities": identity_cache.load(db),
+        }
+    finally:
+        db.close()
+
+
+def run_warmup():
+    """
+    Runs the warm-up phase. Failures are logged and leave the worker
+    alive but not ready, so the readiness probe keeps it out of rotation
+    until start_retry_loop() succeeds.
+    """
+
+    start = time.perf_counter()
+
+    try:
+        connections = warm_pool()
+        cached = preload_caches()
+    except Exception as exc:
+        _state["ready"] = False
+        _state["error"] = str(exc)
+        startup_logger.error(
+            "Warm-up failed",
+            extra={"extra": {"error": str(exc)}},
+        )
+        return False
+
+    _state["ready"] = True
+    _state["error"] = None
+
+    startup_logger.info(
+        "Warm-up completed",
+        extra={
+            "extra": {
+                "connections": connections,
+                "cached": cached,
+                "duration": time.perf_counter() - start,
+            },
+        },
+    )
+
+    return True
+
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+
+def start_retry_loop() -> threading.Thread:
+    """
+    Retries a failed warm-up every WARMUP_RETRY_SECONDS in the background,
+    so a worker that started during a DB outage rejoins rotation without
+    the readiness probe doing any connection work itself.
+    """
+
+    def retry():
+        while not _state["ready"]:
+            time.sleep(WARMUP_RETRY_SECONDS)
+            run_warmup()
+
+    thread = threading.Thread(target=retry, name="warmup-retry", daemon=True)
+    thread.start()
+
+    return thread
+
+
+def last_error():
+    return _state["error"]
+
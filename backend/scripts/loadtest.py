@@ -0,0 +1,404 @@
+"""
+Load-test harness replaying a dashboard traffic mix against the API.
+
+Each virtual user loops for the test duration, picking a scenario by
+weight (paged /api/attempts with filters and search, /api/leaderboard
+for hot tests, attempt detail, recompute, ...). An ingest can run in
+parallel. Reports throughput and p50/p95/p99 latency per scenario and
+saves the results as JSON.
+
+Usage (from backend/):
+
+    # against an already running server
+    python scripts/loadtest.py --base-url http://localhost:8000 --users 20 --duration 60
+
+    # start one uvicorn worker against the local Postgres in DATABASE_URL
+    python scripts/loadtest.py --start-server --users 20 --duration 60 --ingest
+
+The mix can be overridden with --mix attempts_page=50,leaderboard=20,...
+
+Limitation: ingest currently creates one Test row per event, so each
+test_id has exactly one attempt. "Hot tests" are picked by test name,
+but /api/leaderboard and /api/tests/{id}/distribution still only see
+the single attempt behind the chosen id, so those scenarios measure
+per-request overhead rather than large per-test result sets.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+
+DEFAULT_MIX = {
+    "attempts_page": 40,
+    "attempts_search": 10,
+    "leaderboard": 20,
+    "attempt_detail": 15,
+    "recompute": 5,
+    "distribution": 5,
+    "student_history": 5,
+}
+
+STATUSES = ["SCORED", "DEDUPED"]
+
+HOT_TESTS = 5
+
+REQUEST_TIMEOUT = 30
+
+
+# -----------------------
+# Traffic data
+# -----------------------
+class TrafficData:
+    """
+    Ids sampled from the running API, so requests hit real rows.
+    """
+
+    def __init__(self, session, base_url, sample_size):
+        attempts = session.get(
+            f"{base_url}/api/attempts", params={"limit": 100, "offset": 0}, timeout=REQUEST_TIMEOUT
+        ).json()
+
+        rows = list(attempts["data"])
+        offset = len(rows)
+
+        while offset < min(sample_size, attempts["total"]):
+            page = session.get(
+                f"{base_url}/api/attempts", params={"limit": 100, "offset": offset}, timeout=REQUEST_TIMEOUT
+            ).json()["data"]
+            if not page:
+                break
+            rows.extend(page)
+            offset += len(page)
+
+        if not rows:
+            raise SystemExit("No attempts found, load data before running the load test")
+
+        self.total_attempts = attempts["total"]
+        self.attempt_ids = [r["attempt_id"] for r in rows]
+        self.student_ids = sorted({r["student_id"] for r in rows})
+        self.names = sorted({r["student_name"] for r in rows if r["student_name"]})
+
+        # Ingest creates one Test row per event, so every test_id has a
+        # single attempt. Group by test name to find the busy exams.
+        ids_by_name = {}
+        for r in rows:
+            ids_by_name.setdefault(r["test_name"], []).append(r["test_id"])
+
+        hot_names = sorted(ids_by_name, key=lambda n: len(ids_by_name[n]), reverse=True)
+        self.hot_tests = [ids_by_name[name] for name in hot_names[:HOT_TESTS]]
+
+    def hot_test(self):
+        # skew towards the busiest exams, like a live exam day
+        weights = [1 / (i + 1) for i in range(len(self.hot_tests))]
+        return random.choice(random.choices(self.hot_tests, weights=weights)[0])
+
+    def search_term(self):
+        if not self.names:
+            return "a"
+        name = random.choice(self.names)
+        return name[: random.randint(1, min(6, len(name)))]
+
+
+# -----------------------
+# Scenarios
+# -----------------------
+def attempts_page(session, base_url, data, timeout):
+    params = {
+        "limit": random.choice([20, 50, 100]),
+        "offset": random.randrange(0, max(1, data.total_attempts), 20),
+    }
+
+    if random.random() < 0.5:
+        params["test_id"] = data.hot_test()
+    if random.random() < 0.3:
+        params["status"] = random.choice(STATUSES)
+    if random.random() < 0.2:
+        params["has_duplicates"] = random.choice(["true", "false"])
+
+    return session.get(f"{base_url}/api/attempts", params=params, timeout=timeout)
+
+
+def attempts_search(session, base_url, data, timeout):
+    params = {"limit": 20, "offset": 0, "search": data.search_term()}
+    return session.get(f"{base_url}/api/attempts", params=params, timeout=timeout)
+
+
+def leaderboard(session, base_url, data, timeout):
+    return session.get(f"{base_url}/api/leaderboard", params={"test_id": data.hot_test()}, timeout=timeout)
+
+
+def attempt_detail(session, base_url, data, timeout):
+    return session.get(f"{base_url}/api/attempts/{random.choice(data.attempt_ids)}", timeout=timeout)
+
+
+def recompute(session, base_url, data, timeout):
+    return session.post(f"{base_url}/api/attempts/{random.choice(data.attempt_ids)}/recompute", timeout=timeout)
+
+
+def distribution(session, base_url, data, timeout):
+    return session.get(f"{base_url}/api/tests/{data.hot_test()}/distribution", timeout=timeout)
+
+
+def student_history(session, base_url, data, timeout):
+    return session.get(f"{base_url}/api/students/{random.choice(data.student_ids)}/history", timeout=timeout)
+
+
+SCENARIOS = {
+    "attempts_page": attempts_page,
+    "attempts_search": attempts_search,
+    "leaderboard": leaderboard,
+    "attempt_detail": attempt_detail,
+    "recompute": recompute,
+    "distribution": distribution,
+    "student_history": student_history,
+}
+
+
+# -----------------------
+# Recording
+# -----------------------
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, name, latency, ok):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = max(0, int(round(p / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(recorder, elapsed):
+    endpoints = {}
+
+    for name, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": recorder.errors.get(name, 0),
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+
+    total = sum(e["requests"] for e in endpoints.values())
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "total_requests": total,
+        "total_errors": sum(e["errors"] for e in endpoints.values()),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0,
+        "endpoints": endpoints,
+    }
+
+
+# -----------------------
+# Workers
+# -----------------------
+def user_loop(base_url, data, mix, recorder, stop_at, record_after, think_time, timeout):
+    session = requests.Session()
+    names = list(mix)
+    weights = [mix[n] for n in names]
+
+    while time.monotonic() < stop_at:
+        name = random.choices(names, weights=weights)[0]
+
+        start = time.perf_counter()
+        try:
+            response = SCENARIOS[name](session, base_url, data, timeout)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        latency = time.perf_counter() - start
+
+        if time.monotonic() >= record_after:
+            recorder.record(name, latency, ok)
+
+        if think_time:
+            time.sleep(random.uniform(0, think_time))
+
+
+def ingest_loop(base_url, recorder, stop_at, record_after, interval, timeout):
+    """
+    Runs /load-json over the recorded window, back to back unless an
+    interval is given, so user traffic is measured while ingest runs.
+    """
+
+    session = requests.Session()
+
+    wait = record_after - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+
+    while time.monotonic() < stop_at:
+        start = time.perf_counter()
+        try:
+            ok = session.post(f"{base_url}/load-json", timeout=timeout).status_code < 400
+        except requests.RequestException:
+            ok = False
+        recorder.record("ingest", time.perf_counter() - start, ok)
+
+        if interval:
+            time.sleep(interval)
+
+
+# -----------------------
+# Server
+# -----------------------
+def start_server(port):
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", "1"],
+        cwd=backend_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/health/ready", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+
+    process.terminate()
+    raise SystemExit("Server did not become ready within 60s")
+
+
+def parse_mix(value):
+    if not value:
+        return dict(DEFAULT_MIX)
+
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name}, choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight)
+
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--start-server", action="store_true", help="run one uvicorn worker for the test")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds, including warm-up")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds not recorded")
+    parser.add_argument("--think-time", type=float, default=0, help="max random pause between requests")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="per-request timeout in seconds")
+    parser.add_argument("--mix", help="scenario weights, e.g. attempts_page=50,leaderboard=30")
+    parser.add_argument("--ingest", action="store_true", help="run /load-json in parallel")
+    parser.add_argument("--ingest-interval", type=float, default=0, help="pause between ingests, 0 runs them back to back")
+    parser.add_argument("--ingest-timeout", type=float, default=600, help="timeout for one /load-json call")
+    parser.add_argument("--sample-size", type=int, default=500, help="attempts sampled for ids")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="results file, defaults to loadtest-<timestamp>.json")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    mix = parse_mix(args.mix)
+    server = None
+    base_url = args.base_url.rstrip("/")
+
+    if args.start_server:
+        server, base_url = start_server(args.port)
+
+    try:
+        data = TrafficData(requests.Session(), base_url, args.sample_size)
+        recorder = Recorder()
+
+        started = time.monotonic()
+        record_after = started + args.warmup
+        stop_at = started + args.duration
+
+        threads = [
+            threading.Thread(
+                target=user_loop,
+                args=(base_url, data, mix, recorder, stop_at, record_after, args.think_time, args.timeout),
+            )
+            for _ in range(args.users)
+        ]
+
+        if args.ingest:
+            threads.append(
+                threading.Thread(
+                    target=ingest_loop,
+                    args=(base_url, recorder, stop_at, record_after, args.ingest_interval, args.ingest_timeout),
+                )
+            )
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # the recorded window, not time spent waiting for stragglers in join()
+        elapsed = max(stop_at - record_after, 0.001)
+
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    results = {
+        "run_at": datetime.utcnow().isoformat(),
+        "base_url": base_url,
+        "config": {
+            "users": args.users,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "think_time": args.think_time,
+            "timeout": args.timeout,
+            "mix": mix,
+            "ingest": args.ingest,
+            "ingest_interval": args.ingest_interval,
+            "ingest_timeout": args.ingest_timeout,
+        },
+        **summarize(recorder, elapsed),
+    }
+
+    output = args.output or f"loadtest-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'scenario':<18}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, e in results["endpoints"].items():
+        print(
+            f"{name:<18}{e['requests']:>8}{e['errors']:>6}{e['throughput_rps']:>9}"
+            f"{e['p50_ms']:>10}{e['p95_ms']:>10}{e['p99_ms']:>10}"
+        )
+    print(f"\ntotal {results['total_requests']} requests, {results['throughput_rps']} rps, saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
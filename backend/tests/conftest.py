@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import db as app_db  # noqa: E402
+from app import models  # noqa: E402
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """
+    Points the lazily created engine at a throwaway SQLite file.
+    """
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    app_db.Base.metadata.create_all(bind=engine)
+
+    monkeypatch.setattr(app_db, "_engine", engine)
+    app_db._session_factory.configure(bind=engine)
+
+    yield engine
+
+    engine.dispose()
@@ -0,0 +1,112 @@
+import json
+
+from app import models
+from app import tail
+from app.db import SessionLocal
+from app.ingest import ingest_event
+from app.tail import Tailer
+
+
+def make_event(event_id, email):
+    return {
+        "source_event_id": event_id,
+        "student": {"full_name": "Test Student", "email": email},
+        "test": {
+            "name": "Mock",
+            "max_marks": 100,
+            "negative_marking": {"correct": 4, "wrong": -1, "skip": 0},
+        },
+        "started_at": "2026-01-06T06:16:00Z",
+        "submitted_at": "2026-01-06T07:16:00Z",
+        "answers": {"1": "A", "2": "B"},
+    }
+
+
+def write_events(path, events, mode="w"):
+    with open(path, mode) as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def ingested_ids():
+    db = SessionLocal()
+    try:
+        return sorted(row[0] for row in db.query(models.Attempt.source_event_id))
+    finally:
+        db.close()
+
+
+def checkpoint():
+    db = SessionLocal()
+    try:
+        row = db.query(models.IngestCheckpoint).one()
+        return row.file_name, row.offset
+    finally:
+        db.close()
+
+
+def poll(tailer, times=3):
+    for _ in range(times):
+        tailer.poll_once()
+
+
+def test_ingests_and_checkpoints(sqlite_db, tmp_path):
+    path = tmp_path / "events.ndjson"
+    write_events(path, [make_event("evt_1", "a@x.com"), make_event("evt_2", "b@x.com")])
+
+    tailer = Tailer(str(path), batch_size=2)
+    poll(tailer)
+
+    assert ingested_ids() == ["evt_1", "evt_2"]
+    assert checkpoint() == ("events.ndjson", path.stat().st_size)
+
+
+def test_resumes_after_truncation(sqlite_db, tmp_path):
+    path = tmp_path / "events.ndjson"
+    write_events(path, [make_event("evt_1", "a@x.com"), make_event("evt_2", "b@x.com")])
+
+    tailer = Tailer(str(path), batch_size=2)
+    poll(tailer)
+
+    write_events(path, [make_event("evt_3", "c@x.com")])
+    tailer.batch_seconds = 0
+    poll(tailer)
+
+    assert ingested_ids() == ["evt_1", "evt_2", "evt_3"]
+    assert checkpoint() == ("events.ndjson", path.stat().st_size)
+
+
+def test_moves_on_when_checkpointed_file_is_removed(sqlite_db, tmp_path):
+    first = tmp_path / "a.ndjson"
+    second = tmp_path / "b.ndjson"
+    write_events(first, [make_event("evt_1", "a@x.com")])
+
+    tailer = Tailer(str(tmp_path), batch_size=1)
+    poll(tailer)
+
+    write_events(second, [make_event("evt_2", "b@x.com")])
+    first.unlink()
+    poll(tailer)
+
+    assert ingested_ids() == ["evt_1", "evt_2"]
+    assert checkpoint() == ("b.ndjson", second.stat().st_size)
+
+
+def test_failed_event_is_not_remembered(sqlite_db, tmp_path, monkeypatch):
+    path = tmp_path / "events.ndjson"
+    write_events(path, [make_event("evt_1", "a@x.com")])
+
+    def failing_ingest(db, raw, event):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(tail, "ingest_event", failing_ingest)
+    tailer = Tailer(str(path), batch_size=1)
+    poll(tailer)
+    monkeypatch.setattr(tail, "ingest_event", ingest_event)
+
+    assert "evt_1" not in tailer.recent
+
+    write_events(path, [make_event("evt_1", "a@x.com")], mode="a")
+    poll(tailer)
+
+    assert ingested_ids() == ["evt_1"]
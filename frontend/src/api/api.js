@@ -12,6 +12,8 @@ export const getTests = () => API.get("/api/tests");
 export const getAttempts = (params) =>
   API.get("/api/attempts", { params });
 export const getFlags = () => API.get("/api/flags");
+export const getStudentHistory = (studentId) =>
+  API.get(`/api/students/${studentId}/history`);
 
 // --------------------
 // Leaderboard
@@ -19,6 +21,15 @@ export const getFlags = () => API.get("/api/flags");
 export const getLeaderboard = (testId) =>
   API.get(`/api/leaderboard?test_id=${testId}`);
 
+// --------------------
+// Score Distribution
+// --------------------
+export const getDistribution = (testId) =>
+  API.get(`/api/tests/${testId}/distribution`);
+
+export const getPercentile = (testId, score) =>
+  API.get(`/api/tests/${testId}/percentile?score=${score}`);
+
 // --------------------
 // Attempt Actions
 // --------------------